@@ -46,3 +46,8 @@ CHAT_CONTAINER_HEIGHT = 350
 # 로깅
 LOG_DIR = "logs"
 ENABLE_LOGGING = True
+
+# 캐시 (메모리 매핑 장애물 그리드 / 경로표)
+CACHE_DIR = "logs/cache"
+CACHE_MAX_MB = 512  # 초과 시 오래 쓰지 않은 위협 집합부터 삭제
+ENABLE_CACHE = True
@@ -0,0 +1,184 @@
+"""
+메모리 매핑 캐시 - 장애물 그리드 / 경로표 공유
+위협 집합 해시를 키로 여러 세션·프로세스가 같은 파일을 zero-copy로 참조
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from modules.config import CACHE_DIR, CACHE_MAX_MB, ENABLE_CACHE
+
+
+# 장애물 형상에 영향을 주는 필드 (이름 등은 키에서 제외)
+GEOMETRY_FIELDS = ("lat", "lon", "radius_km", "lat_min", "lat_max", "lon_min", "lon_max")
+
+# 지점별 트리 파일 접두어 - 사용 중인 키 디렉토리 안에서도 개별 삭제 대상
+POINT_TREE_PREFIX = "tree_"
+
+
+def threat_set_key(threats: List[dict], margin: float, grid_size: int, bounds: List[float]) -> str:
+    """위협 형상 + 마진 + 그리드 설정 → 해시 키 (위협 순서·이름, int/float 표기 무관)"""
+    shapes = []
+    for t in threats:
+        shape = {k: float(t[k]) for k in GEOMETRY_FIELDS if t.get(k) is not None}
+        shape["type"] = t["type"]
+        shapes.append(json.dumps(shape, sort_keys=True))
+
+    payload = json.dumps(
+        {
+            "threats": sorted(shapes),
+            "margin": float(margin),
+            "grid_size": grid_size,
+            "bounds": bounds
+        },
+        sort_keys=True
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class GridCache:
+    """
+    .npy 파일 기반 배열 캐시
+
+    저장은 임시 파일 → os.replace로 원자적으로 수행하고,
+    조회는 np.load(mmap_mode='r')로 읽기 전용 메모리 매핑을 돌려준다.
+
+    용량이 max_mb를 넘으면 저장 시 가장 오래 쓰지 않은 키 디렉토리부터 삭제한다.
+    사용 중인 키 디렉토리는 지점별 트리 파일(tree_*)만 오래된 순으로 삭제한다.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, enabled: bool = ENABLE_CACHE,
+                 max_mb: float = CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def path(self, key: str, name: str) -> str:
+        return os.path.join(self.cache_dir, key, f"{name}.npy")
+
+    def load(self, key: str, name: str) -> Optional[np.ndarray]:
+        """캐시된 배열 (메모리 매핑) 또는 None"""
+        if not self.enabled:
+            return None
+
+        filepath = self.path(key, name)
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            array = np.load(filepath, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 캐시 로드 실패 ({filepath}): {str(e)}")
+            return None
+
+        try:
+            os.utime(filepath)  # LRU 기준 시각 갱신
+        except OSError:
+            pass
+        return array
+
+    def store(self, key: str, name: str, array: np.ndarray, prune: bool = True) -> np.ndarray:
+        """
+        배열 저장 후 메모리 매핑으로 다시 열어 반환 (실패시 원본 반환)
+
+        여러 배열을 연달아 저장할 때는 prune=False로 저장한 뒤 prune()을 한 번 호출한다.
+        """
+        if not self.enabled:
+            return array
+
+        filepath = self.path(key, name)
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, filepath)
+        except OSError as e:
+            print(f"⚠️ 캐시 저장 실패 ({filepath}): {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return array
+
+        if prune:
+            self.prune(keep=key, protect=[name])
+        cached = self.load(key, name)
+        return array if cached is None else cached
+
+    def prune(self, keep: Optional[str] = None, protect: Optional[List[str]] = None):
+        """
+        용량 상한 초과분 정리 (mtime 기준 LRU)
+
+        Args:
+            keep: 사용 중인 키 - 디렉토리는 남기고 지점별 트리 파일만 삭제 대상
+            protect: keep 디렉토리에서 삭제하지 않을 배열 이름 (방금 저장한 것 등)
+
+        다른 프로세스가 매핑 중이라 지울 수 없는 파일(Windows)은 건너뛴다.
+        """
+        if not self.enabled or not os.path.isdir(self.cache_dir):
+            return
+
+        protected = {_point_group(n) for n in (protect or [])}
+        units = []  # (mtime, 크기, 삭제 경로 목록, 디렉토리 여부)
+        total = 0
+        for key in os.listdir(self.cache_dir):
+            dirpath = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(dirpath):
+                continue
+            try:
+                files = {f: os.stat(os.path.join(dirpath, f)) for f in os.listdir(dirpath)}
+                dir_mtime = os.path.getmtime(dirpath)
+            except OSError:
+                continue  # 다른 프로세스가 동시에 정리 중
+            total += sum(st.st_size for st in files.values())
+
+            if key != keep:
+                mtime = max([dir_mtime] + [st.st_mtime for st in files.values()])
+                units.append((mtime, sum(st.st_size for st in files.values()), [dirpath], True))
+                continue
+
+            groups = {}
+            for f, st in files.items():
+                group = _point_group(f[:-len(".npy")]) if f.endswith(".npy") else None
+                if group is None or group in protected:
+                    continue
+                groups.setdefault(group, []).append((os.path.join(dirpath, f), st))
+            for members in groups.values():
+                units.append((
+                    max(st.st_mtime for _, st in members),
+                    sum(st.st_size for _, st in members),
+                    [path for path, _ in members],
+                    False
+                ))
+
+        for _, size, paths, is_dir in sorted(units, key=lambda u: u[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                for path in paths:
+                    if is_dir:
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                total -= size
+            except OSError as e:
+                print(f"⚠️ 캐시 정리 실패 ({paths[0]}): {str(e)}")
+
+    def get_or_create(self, key: str, name: str, factory: Callable[[], np.ndarray]) -> np.ndarray:
+        """캐시 조회, 없으면 factory로 생성 후 저장"""
+        cached = self.load(key, name)
+        if cached is not None:
+            return cached
+        return self.store(key, name, factory())
+
+
+def _point_group(name: str) -> Optional[str]:
+    """지점별 트리 배열 이름 → 묶음 이름 (tree_<node>_dist / _pred → tree_<node>)"""
+    if not name.startswith(POINT_TREE_PREFIX):
+        return None
+    return name.rsplit("_", 1)[0]
@@ -1,7 +1,7 @@
 """
 LLM Brain 모듈 - 에러 처리 및 검증 강화
+ollama는 첫 호출 시 로드
 """
-import ollama
 import json
 from typing import Dict, Optional
 from modules.config import LLM_MODEL, LLM_TEMPERATURE, LLM_TIMEOUT, AIRPORTS
@@ -61,6 +61,15 @@ Output JSON ONLY:
 }}
 """
         
+        try:
+            import ollama
+        except ImportError as e:
+            return {
+                "action": "CHAT",
+                "response_text": f"❌ ollama 패키지 로드 실패: {str(e)}. `pip install ollama`로 설치하세요.",
+                "update_params": {}
+            }
+        
         try:
             response = ollama.chat(
                 model=self.model,
@@ -21,6 +21,8 @@ class MissionParams:
     margin: float = DEFAULT_SAFETY_MARGIN
     waypoint: Optional[str] = None
     stpt_gap: int = DEFAULT_STPT_GAP
+    multi_target: bool = False
+    targets: List[Dict] = field(default_factory=list)  # [{"name", "lat", "lon"}, ...]
     
     def to_dict(self):
         return asdict(self)
@@ -1,13 +1,15 @@
 """
 A* 경로탐색 엔진 - 최적화 및 디버깅 강화
+numpy / scipy는 사용 시점에 로드 (헤드리스 워커 기동 시간 단축)
 """
 import math
 import heapq
-import numpy as np
-from scipy.interpolate import splprep, splev
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, TYPE_CHECKING
 from modules.config import GRID_SIZE, MAP_BOUNDS, SMOOTHING_FACTOR
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class AStarPathfinder:
     """A* 알고리즘 기반 경로탐색"""
@@ -66,6 +68,37 @@ class AStarPathfinder:
         
         return False
     
+    def obstacle_grid(self, threats: List[dict], margin: float) -> "np.ndarray":
+        """
+        위협 영역 래스터화 (is_collision의 벡터화 버전)
+
+        Returns:
+            bool 배열 [x, y] - True면 진입 불가 셀
+        """
+        import numpy as np
+
+        margin_deg = margin / 111.0
+
+        xs = np.arange(self.grid_size)
+        lat_1d = np.array([self.to_latlon(0, y)[0] for y in xs])
+        lon_1d = np.array([self.to_latlon(x, 0)[1] for x in xs])
+        lon, lat = np.meshgrid(lon_1d, lat_1d, indexing='ij')
+
+        blocked = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        for t in threats:
+            if t['type'] == "SAM":
+                dist_km = np.sqrt(
+                    ((lat - t['lat']) * 111) ** 2 +
+                    ((lon - t['lon']) * 111 * np.cos(np.radians(lat))) ** 2
+                )
+                blocked |= dist_km < (t['radius_km'] + margin)
+
+            elif t['type'] == "NFZ":
+                blocked |= ((t['lat_min'] - margin_deg <= lat) & (lat <= t['lat_max'] + margin_deg) &
+                            (t['lon_min'] - margin_deg <= lon) & (lon <= t['lon_max'] + margin_deg))
+
+        return blocked
+    
     def find_path(
         self,
         start: List[float],
@@ -162,6 +195,9 @@ def smooth_path(path_coords: List[Tuple[float, float]]) -> List[Tuple[float, flo
     if not path_coords or len(path_coords) < 3:
         return path_coords
     
+    import numpy as np
+    from scipy.interpolate import splprep, splev
+    
     try:
         lat = [p[0] for p in path_coords]
         lon = [p[1] for p in path_coords]
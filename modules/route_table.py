@@ -0,0 +1,395 @@
+"""
+공항 경로표 - 전 공항 최단경로 트리(Dijkstra) 사전 계산
+출발/경유/RTB 변경 시 재탐색 없이 경로 추출
+"""
+import json
+import math
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.config import AIRPORTS
+from modules.pathfinder import AStarPathfinder
+from modules.grid_cache import GridCache, threat_set_key
+
+
+# 8방향 이동 (A*와 동일)
+DIRECTIONS = [
+    (0, 1), (0, -1), (1, 0), (-1, 0),
+    (1, 1), (1, -1), (-1, 1), (-1, -1)
+]
+
+
+def build_grid_graph(blocked: np.ndarray):
+    """
+    장애물 그리드 → 희소 인접 행렬 (CSR)
+
+    간선 u→v는 v가 진입 가능할 때만 존재 (A*와 동일하게 출발 셀은 검사하지 않음).
+    노드 번호는 x * grid_size + y.
+    """
+    from scipy.sparse import csr_matrix
+
+    n = blocked.shape[0]
+    idx = np.arange(n * n).reshape(n, n)
+    rows, cols, weights = [], [], []
+
+    for dx, dy in DIRECTIONS:
+        src = (slice(max(0, -dx), n - max(0, dx)), slice(max(0, -dy), n - max(0, dy)))
+        dst = (slice(max(0, dx), n - max(0, -dx)), slice(max(0, dy), n - max(0, -dy)))
+        free = ~blocked[dst]
+        rows.append(idx[src][free])
+        cols.append(idx[dst][free])
+        weights.append(np.full(int(free.sum()), math.sqrt(dx**2 + dy**2)))
+
+    return csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n * n, n * n)
+    )
+
+
+def shortest_path_trees(graph, sources: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 출발점의 최단경로 트리를 한 번에 계산
+
+    Returns:
+        (dist, pred) - 각각 [len(sources), N] 배열, 도달 불가는 inf / 음수
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    dist, pred = dijkstra(graph, directed=True, indices=sources, return_predecessors=True)
+    return dist, pred.astype(np.int32)
+
+
+def extract_cells(pred: np.ndarray, source: int, target: int) -> List[int]:
+    """최단경로 트리에서 source → target 노드 열 추출 (도달 불가시 빈 리스트)"""
+    if source == target:
+        return [source]
+    if pred[target] < 0:
+        return []
+
+    cells = [target]
+    while cells[-1] != source:
+        cells.append(int(pred[cells[-1]]))
+    return cells[::-1]
+
+
+def subtree_mask(pred: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    """
+    최단경로 트리에서 roots 셀 아래 서브트리 (roots 포함)
+
+    포인터 점프로 조상을 2배씩 거슬러 올라가며 표시 (트리 깊이 d에 대해 log d회)
+    """
+    mask = roots.copy()
+    parent = pred.astype(np.int64)
+    has_parent = parent >= 0
+    while has_parent.any():
+        mask[has_parent] |= mask[parent[has_parent]]
+        parent = np.where(has_parent, parent[np.maximum(parent, 0)], -1)
+        has_parent = parent >= 0
+    return mask
+
+
+def repair_tree(graph, dist: np.ndarray, pred: np.ndarray, source: int,
+                added: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    막힌 셀이 늘어난 뒤 최단경로 트리 부분 복구
+
+    새로 막힌 셀 아래 서브트리만 다시 계산한다. 나머지 셀은 경로가 그대로
+    유효하고 거리는 줄어들 수 없으므로 최단 거리가 유지된다.
+    graph는 새 장애물 기준으로 만든 것이어야 한다.
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    roots = added & np.isfinite(dist)
+    roots[source] = False
+    affected = subtree_mask(pred, roots)
+    if not affected.any():
+        return dist, pred
+
+    dist = np.array(dist, dtype=np.float64)
+    pred = np.array(pred, dtype=np.int32)
+    inner = np.flatnonzero(affected)
+    outer = np.flatnonzero(~affected & np.isfinite(dist))
+    m = len(inner)
+
+    # 경계 간선 (영향 없는 셀 → 영향받은 셀)로 각 셀의 초기 거리와 부모 결정
+    boundary = graph[outer][:, inner].tocoo()
+    cand = dist[outer[boundary.row]] + boundary.data
+    order = np.lexsort((cand, boundary.col))
+    cols, first = np.unique(boundary.col[order], return_index=True)
+    seed = cand[order][first]
+    seed_parent = outer[boundary.row[order][first]]
+
+    # 가상 출발 노드(m)에서 경계 셀로 이어지는 간선을 붙여 영향 영역만 Dijkstra
+    sub = graph[inner][:, inner].tocoo()
+    aug = csr_matrix(
+        (np.concatenate([sub.data, seed]),
+         (np.concatenate([sub.row, np.full(len(cols), m)]), np.concatenate([sub.col, cols]))),
+        shape=(m + 1, m + 1)
+    )
+    sub_dist, sub_pred = dijkstra(aug, directed=True, indices=m, return_predecessors=True)
+
+    parent_of_seed = np.full(m, -9999, dtype=np.int64)
+    parent_of_seed[cols] = seed_parent
+    sub_pred = sub_pred[:m]
+    dist[inner] = sub_dist[:m]
+    pred[inner] = np.where(
+        sub_pred == m, parent_of_seed,
+        np.where(sub_pred >= 0, inner[np.clip(sub_pred, 0, m - 1)], -9999)
+    )
+    return dist, pred
+
+
+class RouteTable:
+    """
+    공항별 최단경로 트리 테이블
+
+    위협이 바뀌면 테이블당 하나뿐인 백그라운드 스레드가 항상 최신 위협 기준으로
+    트리를 다시 계산한다 (도중에 위협이 바뀌면 결과를 버리고 최신 상태로 재시작).
+    위협이 추가되기만 한 경우(막힌 셀 증가)는 새 장애물 아래 서브트리만 복구한다.
+    복구 중인 트리는 조회에 쓰지 않고 A*로 대체한다.
+    장애물 그리드와 완성된 경로표는 GridCache에 저장되어 같은 위협 집합을
+    쓰는 다른 세션·프로세스와 메모리 매핑으로 공유된다.
+    """
+
+    def __init__(self, pathfinder: Optional[AStarPathfinder] = None,
+                 airports: Dict[str, List[float]] = AIRPORTS,
+                 cache: Optional[GridCache] = None):
+        self.pathfinder = pathfinder or AStarPathfinder()
+        self.airports = dict(airports)
+        self.grid_size = self.pathfinder.grid_size
+        self.cache = cache or GridCache()
+
+        self._lock = threading.Lock()
+        self._key = None
+        self._blocked = None
+        self._trees: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._tree_blocked: Dict[str, np.ndarray] = {}  # 트리별 계산 기준 장애물
+        self._pending = set()  # 재계산 / 복구 대기
+        self._unsaved = False  # 완성 후 캐시에 저장할 경로표가 있는지
+        self._generation = 0
+        self._worker = None
+
+        self._nodes = {}
+        for name, coord in self.airports.items():
+            grid = self.pathfinder.to_grid(coord[0], coord[1])
+            if grid != (-1, -1):
+                self._nodes[name] = self._node(grid)
+
+        # 공항 구성이 같은 경로표끼리만 캐시 공유
+        self._names = sorted(self._nodes)
+        tag = json.dumps([[n, self._nodes[n]] for n in self._names], ensure_ascii=False)
+        self._tag = hashlib.sha1(tag.encode('utf-8')).hexdigest()[:12]
+
+    def _node(self, grid: Tuple[int, int]) -> int:
+        return grid[0] * self.grid_size + grid[1]
+
+    def _latlon(self, node: int) -> Tuple[float, float]:
+        x, y = divmod(int(node), self.grid_size)
+        return self.pathfinder.to_latlon(x, y)
+
+    @property
+    def is_ready(self) -> bool:
+        """모든 트리가 최신 위협 기준으로 계산되었는지"""
+        with self._lock:
+            return not self._pending
+
+    def wait(self, timeout: Optional[float] = None):
+        """백그라운드 계산 완료 대기"""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def tree(self, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """최신 위협 기준으로 완성된 공항 트리 (dist, pred) 또는 None"""
+        with self._lock:
+            if name in self._pending:
+                return None
+            return self._trees.get(name)
+
+    def update(self, threats: List[dict], safety_margin: float, wait: bool = False):
+        """
+        위협 변경 반영
+
+        해제된 셀이 있으면 거리가 줄어들 수 있으므로 전체 무효화,
+        막힌 셀만 늘었으면 새 장애물에 닿는 트리만 복구 대상으로 표시.
+        """
+        key = threat_set_key(threats, safety_margin, self.grid_size, self.pathfinder.bounds)
+        with self._lock:
+            unchanged = key == self._key
+        if unchanged:
+            if wait:
+                self.wait()
+            return
+
+        blocked = self.cache.get_or_create(
+            key, "blocked", lambda: self.pathfinder.obstacle_grid(threats, safety_margin)
+        )
+        cached = self._load_routes(key)
+
+        with self._lock:
+            old = self._blocked
+            self._key = key
+            self._blocked = blocked
+            self._generation += 1
+
+            if cached is not None:
+                self._trees = cached
+                self._tree_blocked = {name: blocked for name in cached}
+                self._pending.clear()
+                self._unsaved = False
+            elif old is None or (old & ~blocked).any():
+                self._trees = {}
+                self._tree_blocked = {}
+                self._pending = set(self._nodes)
+                self._unsaved = True
+            else:
+                added = (blocked & ~old).ravel()
+                for name, (dist, _) in self._trees.items():
+                    # 루트 셀이 막혀도 출발은 가능하므로 루트는 제외
+                    reached = added.copy()
+                    reached[self._nodes[name]] = False
+                    if np.isfinite(dist[reached]).any():
+                        self._pending.add(name)
+                self._unsaved = True
+
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+        if wait:
+            self.wait()
+
+    def _run(self):
+        """백그라운드 작업 루프 - 최신 세대만 반영, 할 일이 없으면 종료"""
+        while True:
+            with self._lock:
+                if not self._pending and not self._unsaved:
+                    self._worker = None
+                    return
+                generation = self._generation
+                key = self._key
+                blocked = self._blocked
+                names = sorted(self._pending)
+                full = [n for n in names if n not in self._trees]
+                repair = [(n, self._trees[n], self._tree_blocked[n])
+                          for n in names if n in self._trees]
+
+            results = self._compute(blocked, full, repair)
+
+            with self._lock:
+                # 계산 도중 위협이 다시 바뀌었으면 폐기 후 최신 상태로 재시작
+                if generation != self._generation:
+                    continue
+                for name, tree in results.items():
+                    self._trees[name] = tree
+                    self._tree_blocked[name] = blocked
+                    self._pending.discard(name)
+                if self._pending:
+                    continue
+                trees = dict(self._trees)
+
+            # 완성된 경로표 저장 후 메모리 매핑 버전으로 교체
+            stored = self._store_routes(key, trees)
+            with self._lock:
+                if generation == self._generation:
+                    self._trees = stored
+                    self._unsaved = False
+
+    def _compute(self, blocked: np.ndarray, full: List[str], repair: list):
+        """트리 일괄 계산 + 부분 복구"""
+        results = {}
+        if not full and not repair:
+            return results
+
+        graph = build_grid_graph(blocked)
+        if full:
+            dist, pred = shortest_path_trees(graph, [self._nodes[n] for n in full])
+            for i, name in enumerate(full):
+                results[name] = (dist[i].astype(np.float32), pred[i])
+
+        for name, (dist, pred), base in repair:
+            added = (blocked & ~base).ravel()
+            dist, pred = repair_tree(graph, dist, pred, self._nodes[name], added)
+            results[name] = (np.asarray(dist, dtype=np.float32), pred)
+        return results
+
+    def _route_names(self) -> Tuple[str, str]:
+        return f"routes_{self._tag}_dist", f"routes_{self._tag}_pred"
+
+    def _load_routes(self, key: str) -> Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """캐시된 경로표 (메모리 매핑) 또는 None"""
+        dist_name, pred_name = self._route_names()
+        dist = self.cache.load(key, dist_name)
+        pred = self.cache.load(key, pred_name)
+        if dist is None or pred is None:
+            return None
+        return {name: (dist[i], pred[i]) for i, name in enumerate(self._names)}
+
+    def _store_routes(self, key: str, trees: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        if not trees:
+            return trees
+        dist_name, pred_name = self._route_names()
+        dist = self.cache.store(key, dist_name, np.stack([trees[n][0] for n in self._names]), prune=False)
+        pred = self.cache.store(key, pred_name, np.stack([trees[n][1] for n in self._names]))
+        return {name: (dist[i], pred[i]) for i, name in enumerate(self._names)}
+
+    def _airport_at(self, coord: List[float]) -> Optional[str]:
+        for name, c in self.airports.items():
+            if name in self._nodes and list(c) == list(coord):
+                return name
+        return None
+
+    def lookup(self, start: List[float], end: List[float]) -> Optional[List[Tuple[float, float]]]:
+        """
+        경로표에서 경로 추출
+
+        Returns:
+            경로 리스트, 도달 불가시 빈 리스트, 테이블로 답할 수 없으면 None
+        """
+        start_grid = self.pathfinder.to_grid(start[0], start[1])
+        end_grid = self.pathfinder.to_grid(end[0], end[1])
+        if start_grid == (-1, -1) or end_grid == (-1, -1):
+            return []
+
+        s_name = self._airport_at(start)
+        e_name = self._airport_at(end)
+        s_node = self._node(start_grid)
+        e_node = self._node(end_grid)
+
+        with self._lock:
+            blocked = self._blocked
+            if blocked is None:
+                return None
+            flat = blocked.ravel()
+            ready = {n: t for n, t in self._trees.items() if n not in self._pending}
+
+        if s_name in ready:
+            # 공항 → 임의 지점: 정방향 트리
+            cells = extract_cells(ready[s_name][1], s_node, e_node)
+        elif e_name in ready and not flat[s_node] and not flat[e_node]:
+            # 임의 지점 → 공항: 양 끝이 모두 진입 가능하면 역방향 경로와 동일
+            cells = extract_cells(ready[e_name][1], e_node, s_node)[::-1]
+        else:
+            return None
+
+        if not cells:
+            return []
+        return [start] + [self._latlon(c) for c in cells[1:]]
+
+    def find_path(
+        self,
+        start: List[float],
+        end: List[float],
+        threats: List[dict],
+        safety_margin: float
+    ) -> List[Tuple[float, float]]:
+        """AStarPathfinder.find_path 대체 - 경로표 우선, 없으면 A*"""
+        self.update(threats, safety_margin)
+        path = self.lookup(start, end)
+        if path is None:
+            return self.pathfinder.find_path(start, end, threats, safety_margin)
+        return path
@@ -0,0 +1,260 @@
+"""
+다중 타겟 소티 계획 - 위협 고려 거리행렬 + 방문 순서 최적화
+기지 트리는 경로표에서 재사용, 새 타겟 트리만 다중 출발점 Dijkstra로 일괄 계산하고
+nearest insertion + 2-opt로 방문 순서 결정
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.config import AIRPORTS
+from modules.pathfinder import AStarPathfinder
+from modules.grid_cache import GridCache, threat_set_key
+from modules.route_table import RouteTable, build_grid_graph, shortest_path_trees, extract_cells
+
+
+@dataclass
+class SortiePlan:
+    """소티 계획 결과"""
+    order: List[int] = field(default_factory=list)  # 방문 순서 (targets 인덱스)
+    legs: List[List[Tuple[float, float]]] = field(default_factory=list)  # 기지→T1→...→Tn
+    rtb_leg: List[Tuple[float, float]] = field(default_factory=list)  # Tn→기지 (RTB시)
+    total_cost: float = 0.0  # 그리드 셀 단위 (A* g-score와 동일)
+    unreachable: List[int] = field(default_factory=list)  # 도달 불가 타겟 인덱스
+
+
+def tour_cost(tour: List[int], cost: np.ndarray) -> float:
+    """노드 열 비용 합"""
+    return float(sum(cost[a, b] for a, b in zip(tour, tour[1:])))
+
+
+def nearest_insertion(start: int, nodes: List[int], cost: np.ndarray, closed: bool) -> List[int]:
+    """
+    Nearest insertion 초기해
+
+    Args:
+        start: 출발 노드 (고정)
+        nodes: 방문할 노드
+        closed: True면 start로 복귀하는 순환 경로
+    """
+    tour = [start, start] if closed else [start]
+    remaining = list(nodes)
+
+    while remaining:
+        # 현재 경로에 가장 가까운 노드 선택
+        nxt = min(remaining, key=lambda n: min(min(cost[t, n], cost[n, t]) for t in tour))
+        remaining.remove(nxt)
+
+        # 비용 증가가 최소인 위치에 삽입 (열린 경로는 끝에 붙이는 경우 포함)
+        best_pos, best_delta = None, np.inf
+        for i in range(1, len(tour) if closed else len(tour) + 1):
+            delta = cost[tour[i - 1], nxt]
+            if i < len(tour):
+                delta += cost[nxt, tour[i]] - cost[tour[i - 1], tour[i]]
+            if best_pos is None or delta < best_delta:
+                best_pos, best_delta = i, delta
+        tour.insert(best_pos, nxt)
+
+    return tour
+
+
+def two_opt(tour: List[int], cost: np.ndarray, closed: bool, max_passes: int = 50) -> List[int]:
+    """
+    2-opt 개선 (구간 뒤집기)
+
+    비대칭 비용도 처리하도록 뒤집힌 구간 내부 비용 차이까지 계산
+    """
+    tour = list(tour)
+    last = len(tour) - 2 if closed else len(tour) - 1
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, last):
+            for k in range(i + 1, last + 1):
+                a, b, c = tour[i - 1], tour[i], tour[k]
+                d = tour[k + 1] if k + 1 < len(tour) else None
+
+                delta = cost[a, c] - cost[a, b]
+                if d is not None:
+                    delta += cost[b, d] - cost[c, d]
+                for j in range(i, k):
+                    delta += cost[tour[j + 1], tour[j]] - cost[tour[j], tour[j + 1]]
+
+                if delta < -1e-9:
+                    tour[i:k + 1] = tour[i:k + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+
+    return tour
+
+
+class SortiePlanner:
+    """
+    다중 타겟 소티 계획기
+
+    기지 트리는 RouteTable의 것을 그대로 쓰고, 타겟 트리는 위협 집합별로
+    지점마다 GridCache에 저장한다. 타겟을 추가·이동해도 새 지점만 계산한다.
+    """
+
+    def __init__(self, pathfinder: Optional[AStarPathfinder] = None,
+                 airports: Dict[str, List[float]] = AIRPORTS,
+                 cache: Optional[GridCache] = None,
+                 route_table: Optional[RouteTable] = None):
+        self.pathfinder = pathfinder or AStarPathfinder()
+        self.airports = dict(airports)
+        self.grid_size = self.pathfinder.grid_size
+        self.cache = cache or GridCache()
+        self.route_table = route_table or RouteTable(self.pathfinder, self.airports, self.cache)
+        self._memo_key = None
+        self._memo = {}  # 노드 → (dist, pred), 현재 위협 집합 기준
+
+    def _node(self, coord: List[float]) -> int:
+        x, y = self.pathfinder.to_grid(coord[0], coord[1])
+        if (x, y) == (-1, -1):
+            return -1
+        return x * self.grid_size + y
+
+    def _latlon(self, node: int) -> Tuple[float, float]:
+        x, y = divmod(int(node), self.grid_size)
+        return self.pathfinder.to_latlon(x, y)
+
+    def point_trees(self, nodes: List[int], threats: List[dict],
+                    safety_margin: float) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """
+        지점별 최단경로 트리 (위협 집합 + 지점별 캐시)
+
+        캐시에 없는 지점만 모아 한 번의 다중 출발점 Dijkstra로 계산한다.
+
+        Returns:
+            노드 → (dist, pred)
+        """
+        key = threat_set_key(threats, safety_margin, self.grid_size, self.pathfinder.bounds)
+        if key != self._memo_key:
+            self._memo_key = key
+            self._memo = {}
+
+        missing = []
+        for node in dict.fromkeys(nodes):
+            if node in self._memo:
+                continue
+            dist = self.cache.load(key, f"tree_{node}_dist")
+            pred = self.cache.load(key, f"tree_{node}_pred")
+            if dist is None or pred is None:
+                missing.append(node)
+            else:
+                self._memo[node] = (dist, pred)
+
+        if missing:
+            blocked = self.cache.get_or_create(
+                key, "blocked", lambda: self.pathfinder.obstacle_grid(threats, safety_margin)
+            )
+            dist, pred = shortest_path_trees(build_grid_graph(blocked), missing)
+            for i, node in enumerate(missing):
+                self._memo[node] = (
+                    self.cache.store(key, f"tree_{node}_dist", dist[i].astype(np.float32), prune=False),
+                    self.cache.store(key, f"tree_{node}_pred", pred[i], prune=False)
+                )
+            # 일괄 저장 후 한 번만 정리 (이번 계획에 쓰는 트리는 보호)
+            self.cache.prune(keep=key, protect=[f"tree_{n}_dist" for n in nodes])
+
+        # 더 이상 쓰지 않는 지점은 메모에서 제거 (파일 캐시에는 남음)
+        self._memo = {node: self._memo[node] for node in nodes}
+        return self._memo
+
+    def distance_matrix(self, targets: List[dict], threats: List[dict],
+                        safety_margin: float) -> Tuple[np.ndarray, List[str]]:
+        """
+        기지 + 타겟 간 위협 고려 비용 행렬
+
+        Returns:
+            (cost, labels) - cost[i, j]는 i → j 비용 (도달 불가 inf),
+            labels는 기지명 다음 타겟명 순
+        """
+        coords = list(self.airports.values()) + [[t['lat'], t['lon']] for t in targets]
+        labels = list(self.airports.keys()) + [t.get('name', f"T{i + 1}") for i, t in enumerate(targets)]
+        cost, _, _ = self._matrix(coords, threats, safety_margin)
+        return cost, labels
+
+    def _matrix(self, coords: List[List[float]], threats: List[dict], safety_margin: float):
+        """
+        비용 행렬 + 지점별 트리 (coords는 기지 전체 다음 타겟 순)
+
+        범위 밖 지점은 트리 없이 inf.
+        """
+        nodes = [self._node(c) for c in coords]
+        valid = [i for i, n in enumerate(nodes) if n >= 0]
+        trees = [None] * len(coords)
+
+        # 기지 트리는 경로표에서 재사용
+        self.route_table.update(threats, safety_margin, wait=True)
+        for i, name in enumerate(self.airports):
+            trees[i] = self.route_table.tree(name)
+
+        rest = [i for i in valid if trees[i] is None]
+        if rest:
+            computed = self.point_trees([nodes[i] for i in rest], threats, safety_margin)
+            for i in rest:
+                trees[i] = computed[nodes[i]]
+
+        cost = np.full((len(nodes), len(nodes)), np.inf)
+        if valid:
+            valid_nodes = [nodes[i] for i in valid]
+            for i in valid:
+                cost[i, valid] = trees[i][0][valid_nodes]
+            cost[valid, valid] = 0.0
+
+        return cost, trees, nodes
+
+    def _leg(self, coords, trees, nodes, src: int, dst: int) -> List[Tuple[float, float]]:
+        """src → dst 구간 경로 (find_path와 같은 형식)"""
+        cells = extract_cells(trees[src][1], nodes[src], nodes[dst])
+        return [coords[src]] + [self._latlon(c) for c in cells[1:]]
+
+    def plan(
+        self,
+        start: str,
+        targets: List[dict],
+        threats: List[dict],
+        safety_margin: float,
+        rtb: bool = True
+    ) -> SortiePlan:
+        """
+        소티 계획
+
+        Args:
+            start: 출발 기지명 (AIRPORTS 키)
+            targets: [{"name", "lat", "lon"}, ...]
+            rtb: True면 마지막 타겟에서 출발 기지로 복귀
+
+        Returns:
+            SortiePlan (도달 불가 타겟은 unreachable로 분리)
+        """
+        # 기지 전체를 포함해 행렬을 만들어 두면 출발 기지 / RTB 변경 시 재계산 없음
+        n_bases = len(self.airports)
+        base = list(self.airports).index(start)
+        coords = list(self.airports.values()) + [[t['lat'], t['lon']] for t in targets]
+        cost, trees, nodes = self._matrix(coords, threats, safety_margin)
+
+        reachable, unreachable = [], []
+        for i in range(n_bases, len(coords)):
+            ok = np.isfinite(cost[base, i]) and (not rtb or np.isfinite(cost[i, base]))
+            (reachable if ok else unreachable).append(i)
+
+        if not reachable:
+            return SortiePlan(unreachable=[i - n_bases for i in unreachable])
+
+        tour = nearest_insertion(base, reachable, cost, closed=rtb)
+        tour = two_opt(tour, cost, closed=rtb)
+
+        visits = tour[1:-1] if rtb else tour[1:]
+        legs = [self._leg(coords, trees, nodes, a, b) for a, b in zip(tour, tour[1:])]
+
+        return SortiePlan(
+            order=[i - n_bases for i in visits],
+            legs=legs[:len(visits)],
+            rtb_leg=legs[-1] if rtb else [],
+            total_cost=tour_cost(tour, cost),
+            unreachable=[i - n_bases for i in unreachable]
+        )
@@ -0,0 +1,75 @@
+"""
+모듈 기동 시간 측정
+새 인터프리터에서 import 시간을 재고 logs/에 누적 기록 (lazy import 회귀 감시)
+
+사용법:
+    python -m modules.startup_timer
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Dict, List
+
+from modules.config import LOG_DIR, ENABLE_LOGGING
+
+
+# 측정 대상 (헤드리스 코어 → 수치 모듈 순)
+DEFAULT_MODULES = [
+    "modules.config",
+    "modules.mission_state",
+    "modules.pathfinder",
+    "modules.llm_brain",
+    "modules.grid_cache",
+    "modules.route_table",
+    "modules.sortie_planner",
+]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SNIPPET = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def measure_import_time(module: str, repeats: int = 5) -> float:
+    """
+    새 프로세스에서 import 시간 측정
+
+    Returns:
+        중앙값 (ms)
+    """
+    samples = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(module=module)],
+            capture_output=True, text=True, check=True, cwd=PROJECT_ROOT
+        )
+        samples.append(float(result.stdout.strip()) * 1000)
+    return statistics.median(samples)
+
+
+def measure_startup(modules: List[str] = DEFAULT_MODULES, repeats: int = 5) -> Dict[str, float]:
+    """모듈별 import 시간 (ms)"""
+    return {m: measure_import_time(m, repeats) for m in modules}
+
+
+def log_startup(results: Dict[str, float], filename: str = "startup_times.jsonl"):
+    """측정 결과 누적 기록 (한 줄에 한 번)"""
+    if ENABLE_LOGGING:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        filepath = os.path.join(LOG_DIR, filename)
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "import_ms": {m: round(ms, 1) for m, ms in results.items()}
+        }
+        with open(filepath, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    results = measure_startup()
+    for module, ms in results.items():
+        print(f"{module:<24} {ms:8.1f} ms")
+    log_startup(results)
@@ -1,16 +1,16 @@
 """
 메인 Streamlit UI
 v9.0 - Production Ready
+folium / pandas는 사용하는 구역에서 로드 (첫 렌더링 지연 단축)
 """
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-import pandas as pd
 
-from modules.config import AIRPORTS, MAP_CENTER, MAP_ZOOM, CHAT_CONTAINER_HEIGHT
+from modules.config import AIRPORTS, MAP_BOUNDS, MAP_CENTER, MAP_ZOOM, CHAT_CONTAINER_HEIGHT
 from modules.mission_state import MissionState, Threat
 from modules.llm_brain import LLMBrain
-from modules.pathfinder import AStarPathfinder, smooth_path
+from modules.pathfinder import smooth_path
+from modules.route_table import RouteTable
+from modules.sortie_planner import SortiePlanner
 
 
 # ===== 페이지 설정 =====
@@ -27,6 +27,14 @@ st.title("🚁 통합 임무계획 시스템 v9.0 (Production)")
 if "mission" not in st.session_state:
     st.session_state.mission = MissionState()
 
+# 공항 경로표 (위협 변경 시 백그라운드 재계산)
+if "route_table" not in st.session_state:
+    st.session_state.route_table = RouteTable()
+
+# 다중 타겟 소티 계획기 (기지 트리는 경로표 공유, 타겟 트리는 지점별 캐시)
+if "sortie_planner" not in st.session_state:
+    st.session_state.sortie_planner = SortiePlanner(route_table=st.session_state.route_table)
+
 mission = st.session_state.mission
 
 
@@ -49,6 +57,40 @@ with col_left:
             p.target_lat = c1.number_input("Lat", 33.0, 43.0, p.target_lat, format="%.4f")
             p.target_lon = c2.number_input("Lon", 124.0, 132.0, p.target_lon, format="%.4f")
             
+            p.multi_target = st.checkbox("다중 타겟 모드", value=p.multi_target)
+            if p.multi_target:
+                import pandas as pd
+                
+                st.caption("🎯 타겟 목록 (방문 순서 자동 최적화, 경유지 무시)")
+                
+                # 편집 상태는 입력 데이터 기준 변경분으로 저장되므로 편집기가 살아있는 동안은
+                # 원본 고정, 편집기 상태가 사라졌으면(모드 해제 등) 현재 타겟 목록으로 재생성
+                if "target_editor" not in st.session_state:
+                    st.session_state.target_base = pd.DataFrame(
+                        p.targets, columns=["name", "lat", "lon"]
+                    ).astype({"name": str, "lat": float, "lon": float})
+                
+                target_df = st.data_editor(
+                    st.session_state.target_base,
+                    num_rows="dynamic",
+                    hide_index=True,
+                    key="target_editor",
+                    column_config={
+                        "name": st.column_config.TextColumn("명칭"),
+                        "lat": st.column_config.NumberColumn(
+                            "Lat", min_value=MAP_BOUNDS["min_lat"], max_value=MAP_BOUNDS["max_lat"], format="%.4f"
+                        ),
+                        "lon": st.column_config.NumberColumn(
+                            "Lon", min_value=MAP_BOUNDS["min_lon"], max_value=MAP_BOUNDS["max_lon"], format="%.4f"
+                        ),
+                    }
+                )
+                p.targets = [
+                    {"name": str(r["name"]) if pd.notna(r["name"]) and r["name"] else f"T{i+1}",
+                     "lat": float(r["lat"]), "lon": float(r["lon"])}
+                    for i, r in enumerate(target_df.dropna(subset=["lat", "lon"]).to_dict("records"))
+                ]
+            
             p.rtb = st.checkbox("Strike & RTB", value=p.rtb)
             p.margin = st.slider("안전 마진(km)", 0.0, 50.0, p.margin)
             p.stpt_gap = st.slider("STPT 표시 간격", 1, 50, p.stpt_gap)
@@ -130,6 +172,8 @@ with col_left:
         
         # 위협 목록
         if mission.threats:
+            import pandas as pd
+            
             threat_df = pd.DataFrame([t.to_dict() for t in mission.threats])
             st.dataframe(threat_df, hide_index=True)
             
@@ -155,36 +199,57 @@ with col_left:
 
 # ===== 경로 계산 및 지도 시각화 =====
 with col_right:
-    pathfinder = AStarPathfinder()
+    pathfinder = st.session_state.route_table
     
     start_coord = AIRPORTS[mission.params.start]
     target_coord = [mission.params.target_lat, mission.params.target_lon]
     
     threats_dict = [t.to_dict() for t in mission.threats]
     
-    # Ingress 경로
-    wp_coord = None
-    if mission.params.waypoint and mission.params.waypoint in AIRPORTS:
-        wp_coord = AIRPORTS[mission.params.waypoint]
-    
-    raw_in = []
-    if wp_coord:
-        p1 = pathfinder.find_path(start_coord, wp_coord, threats_dict, mission.params.margin)
-        p2 = pathfinder.find_path(wp_coord, target_coord, threats_dict, mission.params.margin)
-        if p1 and p2:
-            raw_in = p1 + p2[1:]
+    sortie = None
+    if mission.params.multi_target and mission.params.targets:
+        # 다중 타겟 소티 (거리행렬 일괄 계산 + 방문 순서 최적화)
+        sortie = st.session_state.sortie_planner.plan(
+            mission.params.start, mission.params.targets, threats_dict,
+            mission.params.margin, rtb=mission.params.rtb
+        )
+        
+        # 구간별로 평탄화 (타겟 지점을 지나도록)
+        final_in = []
+        for leg in sortie.legs:
+            final_in += smooth_path(leg)
+        final_out = smooth_path(sortie.rtb_leg) if sortie.rtb_leg else []
+        
+        if sortie.unreachable:
+            names = [mission.params.targets[i]["name"] for i in sortie.unreachable]
+            st.warning(f"⚠️ 도달 불가 타겟 제외: {', '.join(names)}")
     else:
-        raw_in = pathfinder.find_path(start_coord, target_coord, threats_dict, mission.params.margin)
-    
-    final_in = smooth_path(raw_in) if raw_in else []
-    
-    # Egress 경로 (RTB)
-    final_out = []
-    if mission.params.rtb:
-        raw_out = pathfinder.find_path(target_coord, start_coord, threats_dict, mission.params.margin)
-        final_out = smooth_path(raw_out) if raw_out else []
+        # Ingress 경로
+        wp_coord = None
+        if mission.params.waypoint and mission.params.waypoint in AIRPORTS:
+            wp_coord = AIRPORTS[mission.params.waypoint]
+        
+        raw_in = []
+        if wp_coord:
+            p1 = pathfinder.find_path(start_coord, wp_coord, threats_dict, mission.params.margin)
+            p2 = pathfinder.find_path(wp_coord, target_coord, threats_dict, mission.params.margin)
+            if p1 and p2:
+                raw_in = p1 + p2[1:]
+        else:
+            raw_in = pathfinder.find_path(start_coord, target_coord, threats_dict, mission.params.margin)
+        
+        final_in = smooth_path(raw_in) if raw_in else []
+        
+        # Egress 경로 (RTB)
+        final_out = []
+        if mission.params.rtb:
+            raw_out = pathfinder.find_path(target_coord, start_coord, threats_dict, mission.params.margin)
+            final_out = smooth_path(raw_out) if raw_out else []
     
     # 지도 생성
+    import folium
+    from streamlit_folium import st_folium
+    
     m = folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM)
     
     # 공항 마커
@@ -197,11 +262,27 @@ with col_right:
         ).add_to(m)
     
     # 타겟 마커
-    folium.Marker(
-        target_coord,
-        icon=folium.Icon(color="red", icon="crosshairs", prefix="fa"),
-        tooltip=f"TARGET: {mission.params.target_name}"
-    ).add_to(m)
+    if sortie:
+        for seq, i in enumerate(sortie.order):
+            tgt = mission.params.targets[i]
+            folium.Marker(
+                [tgt["lat"], tgt["lon"]],
+                icon=folium.Icon(color="red", icon="crosshairs", prefix="fa"),
+                tooltip=f"TARGET {seq+1}: {tgt['name']}"
+            ).add_to(m)
+        for i in sortie.unreachable:
+            tgt = mission.params.targets[i]
+            folium.Marker(
+                [tgt["lat"], tgt["lon"]],
+                icon=folium.Icon(color="gray", icon="crosshairs", prefix="fa"),
+                tooltip=f"UNREACHABLE: {tgt['name']}"
+            ).add_to(m)
+    else:
+        folium.Marker(
+            target_coord,
+            icon=folium.Icon(color="red", icon="crosshairs", prefix="fa"),
+            tooltip=f"TARGET: {mission.params.target_name}"
+        ).add_to(m)
     
     # 위협 시각화
     for t in mission.threats:
@@ -238,6 +319,8 @@ with col_right:
         st.divider()
         st.subheader("📋 Steer Point List")
         
+        import pandas as pd
+        
         gap = mission.params.stpt_gap
         data_in = [
             {"Type": "Ingress", "Seq": i+1, "Lat": f"{p[0]:.4f}", "Lon": f"{p[1]:.4f}"}
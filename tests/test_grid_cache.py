@@ -0,0 +1,121 @@
+"""
+메모리 매핑 캐시 테스트 - 저장/조회, 비활성화, 키 정규화, LRU 정리
+"""
+import os
+import time
+
+import numpy as np
+
+from modules.grid_cache import GridCache, threat_set_key
+
+
+BOUNDS = [33.0, 43.0, 124.0, 132.0]
+SAM = {"name": "SAM-1", "type": "SAM", "lat": 37.2, "lon": 127.8, "radius_km": 20}
+NFZ = {"name": "NFZ-1", "type": "NFZ", "lat_min": 37.5, "lat_max": 37.8, "lon_min": 127.5, "lon_max": 127.8}
+
+
+def test_store_load_round_trip(tmp_path):
+    cache = GridCache(cache_dir=str(tmp_path))
+    array = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+    stored = cache.store("k1", "pred", array)
+    loaded = cache.load("k1", "pred")
+
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(stored, array)
+    np.testing.assert_array_equal(loaded, array)
+    assert loaded.dtype == np.int32
+    assert not [f for f in os.listdir(tmp_path / "k1") if f.endswith(".tmp")]
+
+
+def test_missing_entry(tmp_path):
+    assert GridCache(cache_dir=str(tmp_path)).load("nope", "blocked") is None
+
+
+def test_get_or_create_calls_factory_once(tmp_path):
+    cache = GridCache(cache_dir=str(tmp_path))
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return np.ones((2, 2), dtype=bool)
+
+    first = cache.get_or_create("k1", "blocked", factory)
+    second = cache.get_or_create("k1", "blocked", factory)
+
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first, second)
+
+
+def test_disabled_cache_passes_through(tmp_path):
+    cache = GridCache(cache_dir=str(tmp_path), enabled=False)
+    array = np.zeros(5)
+
+    assert cache.store("k1", "dist", array) is array
+    assert cache.load("k1", "dist") is None
+    assert cache.get_or_create("k1", "dist", lambda: array) is array
+    assert os.listdir(tmp_path) == []
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    array = np.zeros(64 * 1024, dtype=np.float64)  # 512 KB
+    cache = GridCache(cache_dir=str(tmp_path), max_mb=1.2)
+
+    cache.store("old", "dist", array)
+    cache.store("used", "dist", array)
+    past = time.time() - 100
+    os.utime(tmp_path / "old", (past, past))
+    os.utime(tmp_path / "old" / "dist.npy", (past, past))
+    os.utime(tmp_path / "used", (past + 1, past + 1))
+    os.utime(tmp_path / "used" / "dist.npy", (past + 1, past + 1))
+
+    assert cache.load("used", "dist") is not None  # 조회 시 최근 사용으로 갱신
+    cache.store("new", "dist", array)
+
+    assert sorted(os.listdir(tmp_path)) == ["new", "used"]
+
+
+def test_key_ignores_order_and_names():
+    base = threat_set_key([SAM, NFZ], 5.0, 120, BOUNDS)
+    renamed = [dict(NFZ, name="Renamed"), dict(SAM, name="Other")]
+
+    assert threat_set_key(renamed, 5.0, 120, BOUNDS) == base
+    assert threat_set_key([SAM, NFZ], 5, 120, BOUNDS) == base
+    assert threat_set_key([dict(SAM, radius_km=20.0), NFZ], 5.0, 120, BOUNDS) == base
+
+
+def test_key_changes_with_geometry():
+    base = threat_set_key([SAM], 5.0, 120, BOUNDS)
+
+    assert threat_set_key([dict(SAM, lat=37.3)], 5.0, 120, BOUNDS) != base
+    assert threat_set_key([SAM], 6.0, 120, BOUNDS) != base
+    assert threat_set_key([SAM], 5.0, 240, BOUNDS) != base
+
+
+def test_prune_ages_out_point_trees_in_active_key(tmp_path):
+    array = np.zeros(64 * 1024, dtype=np.float64)  # 512 KB
+    cache = GridCache(cache_dir=str(tmp_path), max_mb=1.7)
+
+    cache.store("active", "blocked", array, prune=False)
+    for i, node in enumerate([10, 20]):
+        cache.store("active", f"tree_{node}_dist", array, prune=False)
+        past = time.time() - 100 + i
+        os.utime(tmp_path / "active" / f"tree_{node}_dist.npy", (past, past))
+    cache.store("active", "tree_30_dist", array, prune=False)
+
+    cache.prune(keep="active", protect=["tree_30_dist"])
+
+    # 용량 초과분만큼 가장 오래된 지점 트리 삭제, 공용 배열과 보호 대상은 유지
+    assert sorted(os.listdir(tmp_path / "active")) == ["blocked.npy", "tree_20_dist.npy", "tree_30_dist.npy"]
+
+
+def test_store_without_prune_leaves_cache_over_limit(tmp_path):
+    array = np.zeros(64 * 1024, dtype=np.float64)
+    cache = GridCache(cache_dir=str(tmp_path), max_mb=0.6)
+
+    cache.store("old", "dist", array, prune=False)
+    cache.store("new", "tree_1_dist", array, prune=False)
+    assert sorted(os.listdir(tmp_path)) == ["new", "old"]
+
+    cache.prune(keep="new", protect=["tree_1_dist"])
+    assert os.listdir(tmp_path) == ["new"]
@@ -0,0 +1,19 @@
+"""
+LLM Brain 테스트 - ollama 미설치 시 CHAT 오류 응답
+"""
+import sys
+
+from modules.llm_brain import LLMBrain
+
+
+STATE = {"margin": 5.0, "rtb": True, "waypoint": None, "stpt_gap": 10}
+
+
+def test_missing_ollama_returns_chat_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ollama", None)  # import 시 ImportError
+
+    result = LLMBrain().parse_tactical_command("마진 10km로", STATE)
+
+    assert result["action"] == "CHAT"
+    assert result["update_params"] == {}
+    assert "ollama" in result["response_text"]
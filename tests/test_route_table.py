@@ -0,0 +1,120 @@
+"""
+공항 경로표 테스트 - A* 결과와 비용 일치, 부분 복구 정확성
+"""
+import math
+
+import numpy as np
+import pytest
+
+from modules.config import AIRPORTS
+from modules.grid_cache import GridCache
+from modules.pathfinder import AStarPathfinder
+from modules.route_table import (
+    RouteTable, build_grid_graph, shortest_path_trees, repair_tree, extract_cells
+)
+
+
+THREATS = [
+    {"name": "SAM-1", "type": "SAM", "lat": 37.2, "lon": 127.8, "radius_km": 20},
+    {"name": "NFZ-1", "type": "NFZ", "lat_min": 37.5, "lat_max": 37.8, "lon_min": 127.5, "lon_max": 127.8},
+]
+MARGIN = 5.0
+TARGETS = [[39.0, 125.7], [36.0, 126.2], [38.2, 128.5]]
+
+
+def path_cost(pathfinder, path):
+    """경로 → 그리드 이동 비용 (첫 점은 원래 좌표, 나머지는 셀 좌표)"""
+    if not path:
+        return None
+    min_lat, max_lat, min_lon, max_lon = pathfinder.bounds
+    step_lat = (max_lat - min_lat) / pathfinder.grid_size
+    step_lon = (max_lon - min_lon) / pathfinder.grid_size
+    cells = [pathfinder.to_grid(path[0][0], path[0][1])]
+    cells += [(round((lon - min_lon) / step_lon), round((lat - min_lat) / step_lat)) for lat, lon in path[1:]]
+    return sum(math.dist(a, b) for a, b in zip(cells, cells[1:]))
+
+
+def table_node(pathfinder, coord):
+    x, y = pathfinder.to_grid(coord[0], coord[1])
+    return x * pathfinder.grid_size + y
+
+
+@pytest.fixture(scope="module")
+def table():
+    rt = RouteTable(cache=GridCache(enabled=False))
+    rt.update(THREATS, MARGIN, wait=True)
+    return rt
+
+
+def test_obstacle_grid_matches_is_collision():
+    pf = AStarPathfinder()
+    blocked = pf.obstacle_grid(THREATS, MARGIN)
+    for x in range(0, pf.grid_size, 7):
+        for y in range(0, pf.grid_size, 7):
+            lat, lon = pf.to_latlon(x, y)
+            assert blocked[x, y] == pf.is_collision(lat, lon, THREATS, MARGIN)
+
+
+@pytest.mark.parametrize("start_name", list(AIRPORTS))
+def test_lookup_cost_matches_astar(table, start_name):
+    pf = table.pathfinder
+    start = AIRPORTS[start_name]
+
+    for end in list(AIRPORTS.values()) + TARGETS:
+        for a, b in ((start, end), (end, start)):
+            path = table.lookup(a, b)
+            if path is None:
+                # 테이블로 답할 수 없는 경우 (막힌 공항 셀 역방향)
+                continue
+            expected = pf.find_path(a, b, THREATS, MARGIN)
+            assert (path == []) == (expected == [])
+            if path:
+                assert path[0] == a
+                assert path_cost(pf, path) == pytest.approx(path_cost(pf, expected))
+
+
+def test_find_path_falls_back_for_non_airport_pair(table):
+    path = table.find_path(TARGETS[0], TARGETS[1], THREATS, MARGIN)
+    expected = table.pathfinder.find_path(TARGETS[0], TARGETS[1], THREATS, MARGIN)
+    assert path == expected
+
+
+def test_extract_cells():
+    pred = np.array([-9999, 0, 1, -9999])
+    assert extract_cells(pred, 0, 2) == [0, 1, 2]
+    assert extract_cells(pred, 0, 0) == [0]
+    assert extract_cells(pred, 0, 3) == []
+
+
+def test_repair_tree_matches_full_rebuild():
+    pf = AStarPathfinder()
+    added_threat = {"name": "SAM-2", "type": "SAM", "lat": 36.0, "lon": 128.0, "radius_km": 30}
+    before = pf.obstacle_grid(THREATS, MARGIN)
+    after = pf.obstacle_grid(THREATS + [added_threat], MARGIN)
+    graph = build_grid_graph(after)
+    sources = [table_node(pf, AIRPORTS["부산(Busan)"]), table_node(pf, AIRPORTS["서울(Seoul)"])]
+
+    old_dist, old_pred = shortest_path_trees(build_grid_graph(before), sources)
+    new_dist, _ = shortest_path_trees(graph, sources)
+
+    for i, source in enumerate(sources):
+        dist, pred = repair_tree(graph, old_dist[i], old_pred[i], source, (after & ~before).ravel())
+        np.testing.assert_allclose(dist, new_dist[i])
+
+        # 복구된 부모 포인터를 따라가도 같은 거리
+        reached = np.flatnonzero(np.isfinite(dist))
+        reached = reached[reached != source]
+        weights = np.asarray(graph[pred[reached], reached]).ravel()
+        np.testing.assert_allclose(dist[pred[reached]] + weights, dist[reached])
+
+
+def test_update_after_added_threat():
+    rt = RouteTable(cache=GridCache(enabled=False))
+    rt.update(THREATS, MARGIN, wait=True)
+    threats = THREATS + [{"name": "SAM-2", "type": "SAM", "lat": 36.0, "lon": 128.0, "radius_km": 30}]
+    rt.update(threats, MARGIN, wait=True)
+    assert rt.is_ready
+
+    start, end = AIRPORTS["부산(Busan)"], TARGETS[0]
+    expected = rt.pathfinder.find_path(start, end, threats, MARGIN)
+    assert path_cost(rt.pathfinder, rt.lookup(start, end)) == pytest.approx(path_cost(rt.pathfinder, expected))
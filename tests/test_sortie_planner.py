@@ -0,0 +1,135 @@
+"""
+소티 계획 테스트 - 방문 순서 휴리스틱, 지점별 트리 캐시
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from modules.grid_cache import GridCache
+from modules.sortie_planner import SortiePlanner, nearest_insertion, two_opt, tour_cost
+
+
+THREATS = [{"name": "SAM-1", "type": "SAM", "lat": 37.2, "lon": 127.8, "radius_km": 20}]
+MARGIN = 5.0
+TARGETS = [
+    {"name": "T1", "lat": 39.0, "lon": 125.7},
+    {"name": "T2", "lat": 38.2, "lon": 128.5},
+    {"name": "T3", "lat": 36.0, "lon": 126.2},
+    {"name": "T4", "lat": 37.8, "lon": 126.9},
+]
+
+
+def random_costs(n, seed, symmetric=True):
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    cost = np.linalg.norm(points[:, None] - points[None], axis=2)
+    if not symmetric:
+        cost = cost * rng.uniform(1.0, 1.2, size=cost.shape)
+        np.fill_diagonal(cost, 0.0)
+    return cost
+
+
+def brute_force(cost, closed):
+    n = len(cost)
+    return min(
+        tour_cost([0, *perm] + ([0] if closed else []), cost)
+        for perm in itertools.permutations(range(1, n))
+    )
+
+
+@pytest.mark.parametrize("closed", [True, False])
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_heuristic_returns_valid_permutation(closed, symmetric):
+    for seed in range(10):
+        cost = random_costs(12, seed, symmetric)
+        tour = two_opt(nearest_insertion(0, list(range(1, 12)), cost, closed), cost, closed)
+
+        assert tour[0] == 0
+        visits = tour[1:-1] if closed else tour[1:]
+        if closed:
+            assert tour[-1] == 0
+        assert sorted(visits) == list(range(1, 12))
+
+
+@pytest.mark.parametrize("closed", [True, False])
+def test_heuristic_close_to_brute_force(closed):
+    for seed in range(20):
+        cost = random_costs(7, seed)
+        tour = two_opt(nearest_insertion(0, list(range(1, 7)), cost, closed), cost, closed)
+        assert tour_cost(tour, cost) <= brute_force(cost, closed) * 1.1
+
+
+def test_two_opt_never_worsens():
+    cost = random_costs(10, 0, symmetric=False)
+    tour = [0, *range(1, 10), 0]
+    assert tour_cost(two_opt(tour, cost, closed=True), cost) <= tour_cost(tour, cost)
+
+
+@pytest.fixture
+def planner(tmp_path):
+    return SortiePlanner(cache=GridCache(cache_dir=str(tmp_path)))
+
+
+def test_plan_visits_every_reachable_target(planner):
+    plan = planner.plan("부산(Busan)", TARGETS, THREATS, MARGIN, rtb=True)
+
+    assert sorted(plan.order + plan.unreachable) == list(range(len(TARGETS)))
+    assert len(plan.legs) == len(plan.order)
+    assert plan.legs[0][0] == planner.airports["부산(Busan)"]
+    assert plan.rtb_leg[-1] == pytest.approx(planner.pathfinder.to_latlon(
+        *planner.pathfinder.to_grid(*planner.airports["부산(Busan)"])
+    ))
+
+
+def test_plan_marks_blocked_target_unreachable(planner):
+    targets = TARGETS + [{"name": "Inside", "lat": 37.2, "lon": 127.8}]
+    plan = planner.plan("부산(Busan)", targets, THREATS, MARGIN)
+    assert plan.unreachable == [len(TARGETS)]
+
+
+def test_target_edit_computes_only_new_tree(planner, monkeypatch):
+    planner.plan("부산(Busan)", TARGETS, THREATS, MARGIN)
+
+    import modules.sortie_planner as sortie_planner
+    computed = []
+    original = sortie_planner.shortest_path_trees
+
+    def spy(graph, sources):
+        computed.append(list(sources))
+        return original(graph, sources)
+
+    monkeypatch.setattr(sortie_planner, "shortest_path_trees", spy)
+
+    # 출발 기지 / RTB 변경은 재계산 없음
+    planner.plan("서울(Seoul)", TARGETS, THREATS, MARGIN, rtb=False)
+    assert computed == []
+
+    # 타겟 하나 이동 → 그 지점만 계산
+    moved = TARGETS[:-1] + [{"name": "T4", "lat": 35.5, "lon": 127.5}]
+    planner.plan("부산(Busan)", moved, THREATS, MARGIN)
+    assert computed == [[planner._node([35.5, 127.5])]]
+
+
+def test_point_trees_reused_across_planners(tmp_path):
+    cache = GridCache(cache_dir=str(tmp_path))
+    first = SortiePlanner(cache=cache)
+    first.plan("부산(Busan)", TARGETS, THREATS, MARGIN)
+
+    second = SortiePlanner(cache=cache)
+    nodes = [second._node([t["lat"], t["lon"]]) for t in TARGETS]
+    trees = second.point_trees(nodes, THREATS, MARGIN)
+    assert all(isinstance(trees[n][0], np.memmap) for n in nodes)
+
+
+def test_point_trees_prune_once_per_batch(planner, monkeypatch):
+    planner.point_trees([planner._node([35.5, 127.5])], THREATS, MARGIN)  # 장애물 그리드 캐시 생성
+    calls = []
+    original = planner.cache.prune
+    monkeypatch.setattr(planner.cache, "prune", lambda **kw: calls.append(kw) or original(**kw))
+
+    nodes = [planner._node([t["lat"], t["lon"]]) for t in TARGETS]
+    planner.point_trees(nodes, THREATS, MARGIN)
+
+    assert len(calls) == 1
+    assert sorted(calls[0]["protect"]) == sorted(f"tree_{n}_dist" for n in nodes)
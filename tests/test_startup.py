@@ -0,0 +1,25 @@
+"""
+기동 시간 회귀 테스트 - 헤드리스 코어가 무거운 의존성을 import 시점에 로드하지 않는지
+"""
+import os
+import subprocess
+import sys
+
+from modules.startup_timer import PROJECT_ROOT
+
+
+LAZY_MODULES = ["modules.pathfinder", "modules.llm_brain"]
+HEAVY_DEPENDENCIES = ["numpy", "scipy", "ollama"]
+
+
+def test_core_modules_defer_heavy_imports():
+    code = (
+        f"import sys; import {', '.join(LAZY_MODULES)}; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT, env=env
+    )
+    assert result.stdout.strip() == ""